@@ -2,7 +2,13 @@
 
 
 def register(linter):
-    """Register ComfyUI checkers with pylint."""
+    """Register ComfyUI checkers with pylint.
+
+    Every checker is registered regardless of which messages are enabled:
+    plugins load before pylint parses --enable/--disable, so the message ids
+    must already exist for those options to resolve. Checkers whose messages
+    all end up disabled are skipped by pylint when walking modules.
+    """
     from pylint_comfyui.checkers.folder_paths import FolderPathsChecker
     from pylint_comfyui.checkers.node_structure import NodeStructureChecker
     from pylint_comfyui.checkers.security import SecurityChecker
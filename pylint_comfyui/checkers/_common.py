@@ -0,0 +1,34 @@
+"""Helpers shared by the ComfyUI checkers."""
+
+from astroid import nodes
+
+
+def get_call_name(node) -> str:
+    """Extract the full name of a function call."""
+    try:
+        return node.func.as_string()
+    except AttributeError:
+        return ""
+
+
+def get_call_leaf(node) -> str:
+    """Get the last segment of a call's name (``join`` for ``os.path.join()``).
+
+    This is cheap compared to get_call_name() and lets checkers discard
+    unrelated calls before building the full dotted name.
+    """
+    func = node.func
+    if isinstance(func, nodes.Attribute):
+        return func.attrname
+    if isinstance(func, nodes.Name):
+        return func.name
+    return ""
+
+
+def get_root_name(node) -> str:
+    """Get the leftmost name of an attribute chain (``os`` for ``os.path.join``)."""
+    while isinstance(node, nodes.Attribute):
+        node = node.expr
+    if isinstance(node, nodes.Name):
+        return node.name
+    return ""
@@ -1,10 +1,82 @@
 """Checker for proper folder_paths usage in ComfyUI nodes."""
 
 import re
+from dataclasses import dataclass
+from typing import Dict, FrozenSet
 
 from pylint.checkers import BaseChecker
+from pylint.checkers.utils import only_required_for_messages
 from pylint.lint import PyLinter
 
+from pylint_comfyui.checkers._common import get_call_leaf, get_call_name
+
+# Filesystem functions that should use folder_paths
+_FS_FUNCTIONS: FrozenSet[str] = frozenset(
+    {
+        "os.path.join",
+        "os.path.exists",
+        "os.path.isfile",
+        "os.path.isdir",
+        "os.path.dirname",
+        "os.path.basename",
+        "os.path.abspath",
+        "os.path.realpath",
+        "os.listdir",
+        "os.makedirs",
+        "os.mkdir",
+        "os.walk",
+        "os.getcwd",
+        "glob.glob",
+        "glob.iglob",
+        "pathlib.Path",
+        "shutil.copy",
+        "shutil.copy2",
+        "shutil.copytree",
+        "shutil.move",
+        "os.scandir",
+        "os.stat",
+        "os.lstat",
+    }
+)
+
+# Attribute names the filesystem functions end with, used to skip unrelated
+# calls before paying for a full as_string() of the callee
+_FS_FUNCTION_LEAVES: FrozenSet[str] = frozenset(
+    name.rsplit(".", 1)[-1] for name in _FS_FUNCTIONS
+)
+
+# Suggestions for how to fix direct filesystem access
+_SUGGESTIONS: Dict[str, str] = {
+    "os.path.join": "Use folder_paths.get_directory() to get base paths first",
+    "os.listdir": "Use folder_paths.get_directory() then os.listdir()",
+    "glob.glob": "Use folder_paths.get_directory() then glob.glob()",
+    "pathlib.Path": "Use folder_paths.get_directory() / pathlib.Path()",
+    "os.makedirs": "Use folder_paths.get_directory() to get base paths",
+}
+_DEFAULT_SUGGESTION = "Consider using folder_paths.get_directory()"
+
+# Patterns for hardcoded paths
+_HARDCODED_PATH_PATTERNS = (
+    r"['\"]\.\.?/",  # Relative paths like "../" or "./"
+    r"['\"][^'\"]*/(models|input|output|temp)[^'\"]*['\"]",  # ComfyUI dirs
+)
+
+# All hardcoded path patterns fused into one alternation, so each string
+# constant is scanned once instead of once per pattern. The bound search
+# method is kept since visit_const runs for every string literal.
+_COMBINED_HARDCODED_SEARCH = re.compile(
+    "|".join(f"(?:{pattern})" for pattern in _HARDCODED_PATH_PATTERNS)
+).search
+
+
+@dataclass
+class _ModuleState:
+    """State collected while walking a single module."""
+
+    folder_paths_imported: bool = False
+    folder_paths_alias: str = "folder_paths"
+    has_filesystem_operations: bool = False
+
 
 class FolderPathsChecker(BaseChecker):
     """Checker to enforce usage of folder_paths module instead of direct filesystem access."""
@@ -46,68 +118,37 @@ class FolderPathsChecker(BaseChecker):
 
     def __init__(self, linter: PyLinter) -> None:
         super().__init__(linter)
-        self.folder_paths_imported: bool = False
-        self.folder_paths_alias: str = "folder_paths"
-        self.has_filesystem_operations: bool = False
-
-        # Filesystem functions that should use folder_paths
-        self.filesystem_functions = {
-            "os.path.join",
-            "os.path.exists",
-            "os.path.isfile",
-            "os.path.isdir",
-            "os.path.dirname",
-            "os.path.basename",
-            "os.path.abspath",
-            "os.path.realpath",
-            "os.listdir",
-            "os.makedirs",
-            "os.mkdir",
-            "os.walk",
-            "os.getcwd",
-            "glob.glob",
-            "glob.iglob",
-            "pathlib.Path",
-            "shutil.copy",
-            "shutil.copy2",
-            "shutil.copytree",
-            "shutil.move",
-            "os.scandir",
-            "os.stat",
-            "os.lstat",
-        }
-
-        # Patterns for hardcoded paths
-        self.hardcoded_path_patterns = [
-            r"['\"]\.\.?/",  # Relative paths like "../" or "./"
-            r"['\"][^'\"]*/(models|input|output|temp)[^'\"]*['\"]",  # ComfyUI dirs
-        ]
+        self._state = _ModuleState()
 
     def visit_module(self, node) -> None:
         """Reset state for each module."""
-        self.folder_paths_imported = False
-        self.folder_paths_alias = "folder_paths"
-        self.has_filesystem_operations = False
+        self._state = _ModuleState()
 
     def visit_import(self, node) -> None:
         """Check for folder_paths imports."""
         for name, alias in node.names:
             if name == "folder_paths":
-                self.folder_paths_imported = True
+                self._state.folder_paths_imported = True
                 if alias:
-                    self.folder_paths_alias = alias
+                    self._state.folder_paths_alias = alias
 
     def visit_importfrom(self, node) -> None:
         """Check for 'from folder_paths import ...' statements."""
         if node.modname == "folder_paths":
-            self.folder_paths_imported = True
+            self._state.folder_paths_imported = True
 
+    @only_required_for_messages(
+        "comfyui-use-folder-paths", "comfyui-missing-folder-paths"
+    )
     def visit_call(self, node) -> None:
         """Check function calls for filesystem operations."""
-        func_name = self._get_call_name(node)
+        if get_call_leaf(node) not in _FS_FUNCTION_LEAVES:
+            return
 
-        if func_name in self.filesystem_functions:
-            self.has_filesystem_operations = True
+        func_name = get_call_name(node)
+
+        if func_name in _FS_FUNCTIONS:
+            self._state.has_filesystem_operations = True
 
             # Check if this is problematic usage
             if not self._is_allowed_filesystem_call(func_name, node):
@@ -120,30 +161,30 @@ class FolderPathsChecker(BaseChecker):
 
     def visit_const(self, node) -> None:
         """Check string constants for hardcoded paths."""
-        if isinstance(node.value, str):
-            for pattern in self.hardcoded_path_patterns:
-                if re.search(pattern, node.value):
-                    self.add_message(
-                        "comfyui-hardcoded-path", node=node, args=(repr(node.value),)
-                    )
-                    break
+        value = node.value
+        if not isinstance(value, str):
+            return
+
+        # Every hardcoded path pattern contains a "/", so most string literals
+        # can be skipped without running the regex at all
+        if "/" not in value:
+            return
+
+        if _COMBINED_HARDCODED_SEARCH(value):
+            self.add_message("comfyui-hardcoded-path", node=node, args=(repr(value),))
 
     def leave_module(self, node) -> None:
         """Check if folder_paths should be imported."""
-        if self.has_filesystem_operations and not self.folder_paths_imported:
+        if (
+            self._state.has_filesystem_operations
+            and not self._state.folder_paths_imported
+        ):
             self.add_message("comfyui-missing-folder-paths", node=node)
 
-    def _get_call_name(self, node) -> str:
-        """Extract the full name of a function call."""
-        try:
-            return node.func.as_string()
-        except AttributeError:
-            return ""
-
     def _is_allowed_filesystem_call(self, func_name: str, node) -> bool:
         """Check if a filesystem call is allowed."""
         # If folder_paths is imported, be more lenient with basic os.path operations
-        if self.folder_paths_imported:
+        if self._state.folder_paths_imported:
             # Allow basic path operations when folder_paths is imported
             # (assuming they're used correctly after getting base paths)
             if func_name in {
@@ -156,7 +197,7 @@ class FolderPathsChecker(BaseChecker):
 
         # Check if the call already uses folder_paths directly
         call_source = self._get_node_source(node)
-        if self.folder_paths_alias in call_source:
+        if self._state.folder_paths_alias in call_source:
             return True
 
         return False
@@ -170,12 +211,4 @@ class FolderPathsChecker(BaseChecker):
 
     def _get_suggestion(self, func_name: str) -> str:
         """Get a suggestion for how to fix the filesystem access."""
-        suggestions = {
-            "os.path.join": "Use folder_paths.get_directory() to get base paths first",
-            "os.listdir": "Use folder_paths.get_directory() then os.listdir()",
-            "glob.glob": "Use folder_paths.get_directory() then glob.glob()",
-            "pathlib.Path": "Use folder_paths.get_directory() / pathlib.Path()",
-            "os.makedirs": "Use folder_paths.get_directory() to get base paths",
-        }
-
-        return suggestions.get(func_name, "Consider using folder_paths.get_directory()")
+        return _SUGGESTIONS.get(func_name, _DEFAULT_SUGGESTION)
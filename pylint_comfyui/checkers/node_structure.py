@@ -1,11 +1,44 @@
 """Checker for ComfyUI node structure and v3 schema compliance."""
 
-import ast
+from dataclasses import dataclass, field
 from typing import List
 
+from astroid import nodes
 from pylint.checkers import BaseChecker
+from pylint.checkers.utils import only_required_for_messages
 from pylint.lint import PyLinter
 
+from pylint_comfyui.checkers._common import get_call_leaf, get_call_name
+
+# Manual device handling that should use model_management.get_torch_device()
+_DEVICE_FUNC_SUBSTRINGS = (
+    "torch.cuda.is_available",
+    "torch.cuda.device_count",
+    "torch.cuda.set_device",
+    "torch.cuda.current_device",
+    "torch.device",
+)
+
+# Last name segments of the device functions, used to skip unrelated calls
+# before building the full dotted name
+_DEVICE_FUNC_LEAVES = frozenset(
+    pattern.rsplit(".", 1)[-1] for pattern in _DEVICE_FUNC_SUBSTRINGS
+)
+
+# Methods that indicate a ComfyUI node (INPUT_TYPES or typical processing)
+_NODE_METHODS = frozenset({"INPUT_TYPES", "execute", "process", "forward", "run"})
+
+# Class attributes that indicate a ComfyUI node
+_NODE_ATTRS = frozenset({"INPUT_TYPES", "RETURN_TYPES", "FUNCTION", "CATEGORY"})
+
+
+@dataclass
+class _ModuleState:
+    """State collected while walking a single module."""
+
+    node_classes: List[nodes.ClassDef] = field(default_factory=list)
+    has_model_management_import: bool = False
+
 
 class NodeStructureChecker(BaseChecker):
     """Checker for ComfyUI node structure and API compliance."""
@@ -35,8 +68,7 @@ class NodeStructureChecker(BaseChecker):
 
     def __init__(self, linter: PyLinter) -> None:
         super().__init__(linter)
-        self.node_classes: List[ast.ClassDef] = []
-        self.has_model_management_import: bool = False
+        self._state = _ModuleState()
 
         # Known ComfyUI public API modules (allowed) - only comfy_api and root level
         self.api_modules = {"folder_paths", "nodes"}
@@ -45,107 +77,80 @@ class NodeStructureChecker(BaseChecker):
         # Internal modules (should be avoided) - anything under comfy/
         self.internal_prefixes = {"comfy"}
 
-    def visit_module(self, node: ast.Module) -> None:
+        # Prefix tuples so str.startswith() tests every prefix in one call
+        self._internal_prefix_tuple = tuple(p + "." for p in self.internal_prefixes)
+        self._api_prefix_tuple = tuple(self.api_prefixes)
+
+    def visit_module(self, node: nodes.Module) -> None:
         """Reset state for each module."""
-        self.node_classes = []
-        self.has_model_management_import = False
+        self._state = _ModuleState()
 
     def visit_import(self, node) -> None:
         """Check imports for non-API usage."""
         for name, _alias in node.names:
             # Check if it's an internal comfy module
-            if any(name.startswith(prefix + ".") for prefix in self.internal_prefixes):
-                if not any(name.startswith(prefix) for prefix in self.api_prefixes):
+            if name.startswith(self._internal_prefix_tuple):
+                if not name.startswith(self._api_prefix_tuple):
                     self.add_message("comfyui-non-api-import", node=node, args=(name,))
 
     def visit_importfrom(self, node) -> None:
         """Check from imports for non-API usage."""
         if node.modname:
             # Check if importing from internal comfy module
-            if any(
-                node.modname.startswith(prefix + ".")
-                for prefix in self.internal_prefixes
-            ):
-                if not any(
-                    node.modname.startswith(prefix) for prefix in self.api_prefixes
-                ):
+            if node.modname.startswith(self._internal_prefix_tuple):
+                if not node.modname.startswith(self._api_prefix_tuple):
                     self.add_message(
                         "comfyui-non-api-import", node=node, args=(node.modname,)
                     )
 
-    def visit_classdef(self, node: ast.ClassDef) -> None:
+    def visit_classdef(self, node: nodes.ClassDef) -> None:
         """Check class definitions for ComfyUI node patterns."""
         # Look for classes that might be ComfyUI nodes
         if self._is_likely_comfyui_node(node):
-            self.node_classes.append(node)
+            self._state.node_classes.append(node)
             self._check_node_structure(node)
 
+    @only_required_for_messages("comfyui-use-model-management")
     def visit_call(self, node) -> None:
         """Check function calls for device handling patterns."""
-        func_name = self._get_call_name(node)
+        if get_call_leaf(node) not in _DEVICE_FUNC_LEAVES:
+            return
+
+        func_name = get_call_name(node)
 
         # Check for manual device handling that should use model_management.get_torch_device()
-        device_patterns = [
-            "torch.cuda.is_available",
-            "torch.cuda.device_count",
-            "torch.cuda.set_device",
-            "torch.cuda.current_device",
-            "torch.device",
-        ]
-
-        for pattern in device_patterns:
+        for pattern in _DEVICE_FUNC_SUBSTRINGS:
             if pattern in func_name:
                 self.add_message(
                     "comfyui-use-model-management",
                     node=node,
                     args=(
-                        f"Use model_management.get_torch_device() instead of {pattern}"
+                        f"Use model_management.get_torch_device() instead of {pattern}",
                     ),
                 )
                 break
 
-    def _is_likely_comfyui_node(self, node: ast.ClassDef) -> bool:
+    def _is_likely_comfyui_node(self, node: nodes.ClassDef) -> bool:
         """Heuristic to determine if a class is likely a ComfyUI node."""
-        # Look for common ComfyUI node patterns
-        method_names = {
-            method.name for method in node.body if isinstance(method, ast.FunctionDef)
-        }
-        class_attrs = {
-            attr.targets[0].id
-            for attr in node.body
-            if isinstance(attr, ast.Assign) and isinstance(attr.targets[0], ast.Name)
-        }
-
-        # Common patterns that indicate ComfyUI nodes
-        node_indicators = [
-            # Has typical ComfyUI methods
-            "INPUT_TYPES" in method_names or "INPUT_TYPES" in class_attrs,
-            "RETURN_TYPES" in class_attrs,
-            "FUNCTION" in class_attrs,
-            "CATEGORY" in class_attrs,
-            # Or has typical processing methods
-            any(
-                method in method_names
-                for method in ["execute", "process", "forward", "run"]
-            ),
-            # Or inherits from common base classes (simplified check)
-            any(
-                "Node" in base.id if isinstance(base, ast.Name) else False
-                for base in node.bases
-            ),
-        ]
-
-        return any(node_indicators)
+        # Look for common ComfyUI node patterns, stopping at the first hit
+        for stmt in node.body:
+            if isinstance(stmt, nodes.FunctionDef):
+                if stmt.name in _NODE_METHODS:
+                    return True
+            elif isinstance(stmt, nodes.Assign):
+                target = stmt.targets[0]
+                if isinstance(target, nodes.AssignName) and target.name in _NODE_ATTRS:
+                    return True
+
+        # Or inherits from common base classes (simplified check)
+        for base in node.bases:
+            if isinstance(base, nodes.Name) and "Node" in base.name:
+                return True
+
+        return False
 
     def _check_node_structure(self, node) -> None:
         """Check if a ComfyUI node follows best practices."""
         # For now, we're not enforcing v3 schema requirements
         # This method can be extended later if needed
         pass
-
-    def _get_call_name(self, node) -> str:
-        """Extract the full name of a function call."""
-        try:
-            return node.func.as_string()
-        except AttributeError:
-            return ""
@@ -2,8 +2,38 @@
 
 import re
 
+from astroid import nodes
 from pylint.checkers import BaseChecker
-from pylint.lint import PyLinter
+from pylint.checkers.utils import only_required_for_messages
+
+from pylint_comfyui.checkers._common import (
+    get_call_leaf,
+    get_call_name,
+    get_root_name,
+)
+
+# Patterns that might indicate obfuscation, each paired with a literal it
+# always contains. The regex only runs once its cheap substring probe hits,
+# so clean files never reach the regex engine.
+_OBFUSCATION_CHECKS = tuple(
+    (anchor, re.compile(pattern))
+    for anchor, pattern in (
+        (b"exec", rb"exec\s*\(\s*''.join\("),  # exec(''.join(...))
+        (b"eval", rb"eval\s*\(\s*''.join\("),  # eval(''.join(...))
+        (b"__import__", rb"__import__\s*\(\s*''.join\("),  # Obfuscated imports
+        (b"chr", rb"chr\s*\(\s*\d+\s*\)"),  # Character code obfuscation
+        (b"fromhex", rb"bytes\.fromhex\s*\("),  # Hex string obfuscation
+    )
+)
+
+# Shell helpers outside the subprocess module that are also flagged
+_SHELL_FUNCTIONS = frozenset({"os.system", "os.popen", "commands.getoutput"})
+
+# Last name segments of every call this checker reports, other than the
+# subprocess module which is matched on its root name instead
+_SECURITY_CALL_LEAVES = frozenset(
+    {"eval", "exec"} | {name.rsplit(".", 1)[-1] for name in _SHELL_FUNCTIONS}
+)
 
 
 class SecurityChecker(BaseChecker):
@@ -50,21 +80,18 @@ class SecurityChecker(BaseChecker):
         ),
     }
 
-    def __init__(self, linter: PyLinter) -> None:
-        super().__init__(linter)
-
-        # Patterns that might indicate obfuscation
-        self.obfuscation_patterns = [
-            r"exec\s*\(\s*''.join\(",  # exec(''.join(...))
-            r"eval\s*\(\s*''.join\(",  # eval(''.join(...))
-            r"__import__\s*\(\s*''.join\(",  # Dynamic imports with obfuscation
-            r"chr\s*\(\s*\d+\s*\)",  # Character code obfuscation
-            r"bytes\.fromhex\s*\(",  # Hex string obfuscation
-        ]
-
+    @only_required_for_messages(
+        "comfyui-no-eval", "comfyui-no-exec", "comfyui-subprocess-warning"
+    )
     def visit_call(self, node) -> None:
         """Check function calls for security issues."""
-        func_name = self._get_call_name(node)
+        if (
+            get_call_leaf(node) not in _SECURITY_CALL_LEAVES
+            and get_root_name(node.func) != "subprocess"
+        ):
+            return
+
+        func_name = get_call_name(node)
 
         # Check for eval/exec
         if func_name == "eval":
@@ -75,55 +102,61 @@ class SecurityChecker(BaseChecker):
         # Check for subprocess calls
         elif func_name.startswith("subprocess."):
             self.add_message("comfyui-subprocess-warning", node=node, args=(func_name,))
-        elif func_name in {"os.system", "os.popen", "commands.getoutput"}:
+        elif func_name in _SHELL_FUNCTIONS:
             self.add_message("comfyui-subprocess-warning", node=node, args=(func_name,))
 
+    @only_required_for_messages("comfyui-no-custom-routes")
     def visit_attribute(self, node) -> None:
         """Check attribute access for PromptServer route registration."""
-        # Check for PromptServer.routes access
-        if hasattr(node, "attrname") and node.attrname == "routes":
-            attr_name = self._get_attribute_name(node)
-            if "PromptServer" in attr_name and "instance" in attr_name:
-                self.add_message(
-                    "comfyui-no-custom-routes", node=node, args=(attr_name,)
-                )
-
-        # Check for direct app manipulation
-        elif hasattr(node, "attrname") and node.attrname == "app":
-            attr_name = self._get_attribute_name(node)
-            if "PromptServer" in attr_name and "instance" in attr_name:
-                self.add_message(
-                    "comfyui-no-custom-routes", node=node, args=(attr_name,)
-                )
-
+        # Only PromptServer.routes access and direct app manipulation matter
+        # (pylint only visits astroid Attribute nodes here, so attrname exists)
+        if node.attrname not in ("routes", "app"):
+            return
+
+        # Inspect the chain structurally; as_string() is only paid on a hit
+        # or for chains that are not plain dotted names
+        if self._is_prompt_server_instance(node):
+            self.add_message(
+                "comfyui-no-custom-routes", node=node, args=(node.as_string(),)
+            )
+
+    @only_required_for_messages("comfyui-no-obfuscation")
     def visit_module(self, node) -> None:
         """Check the entire module for obfuscation patterns."""
+        # Get the source from astroid, which serves in-memory bytes for stdin
+        # and string builds and opens the module's file otherwise
         try:
-            # Get the source code if available
-            if hasattr(node, "lineno") and hasattr(self.linter, "current_file"):
-                with open(self.linter.current_file, encoding="utf-8") as f:
-                    source = f.read()
-                    self._check_obfuscation(source, node)
-        except (OSError, UnicodeDecodeError, AttributeError):
-            pass
-
-    def _check_obfuscation(self, source: str, node) -> None:
+            stream = node.stream()
+            if stream is None:
+                return
+            with stream:
+                raw = stream.read()
+        except OSError:
+            return
+
+        self._check_obfuscation(raw, node)
+
+    def _check_obfuscation(self, raw: bytes, node) -> None:
         """Check source code for obfuscation patterns."""
-        for pattern in self.obfuscation_patterns:
-            if re.search(pattern, source):
+        for anchor, pattern in _OBFUSCATION_CHECKS:
+            if anchor in raw and pattern.search(raw):
                 self.add_message("comfyui-no-obfuscation", node=node)
                 break
 
-    def _get_call_name(self, node) -> str:
-        """Extract the full name of a function call."""
-        try:
-            return node.func.as_string()
-        except AttributeError:
-            return ""
-
-    def _get_attribute_name(self, node) -> str:
-        """Extract the full name of an attribute access."""
-        try:
-            return node.as_string()
-        except AttributeError:
-            return ""
+    def _is_prompt_server_instance(self, node) -> bool:
+        """Check if an attribute access goes through PromptServer.instance."""
+        names = []
+        expr = node.expr
+        while isinstance(expr, nodes.Attribute):
+            names.append(expr.attrname)
+            expr = expr.expr
+        if not isinstance(expr, nodes.Name):
+            # The chain goes through a call, subscript, etc. (for example
+            # getattr(PromptServer, "instance").routes), so match the source
+            attr_name = node.as_string()
+            return "PromptServer" in attr_name and "instance" in attr_name
+        names.append(expr.name)
+
+        return any("PromptServer" in name for name in names) and any(
+            "instance" in name for name in names
+        )
@@ -1,22 +1,50 @@
 """Integration tests for pylint-comfyui plugin."""
 
-import subprocess
-import tempfile
-from pathlib import Path
+from io import StringIO
+
+import pytest
+from pylint.lint import Run
+from pylint.reporters.text import TextReporter
+
+
+@pytest.fixture(scope="session")
+def pylint_runner(tmp_path_factory):
+    """Lint sources in-process, reusing one pylint/astroid import per session.
+
+    The runner lints the given source with only the given messages enabled
+    and returns the text report.
+    """
+
+    def _run(source: str, enable: str) -> str:
+        path = tmp_path_factory.mktemp("node") / "node.py"
+        path.write_text(source)
+
+        output = StringIO()
+        Run(
+            [
+                "--load-plugins=pylint_comfyui",
+                "--disable=all",
+                f"--enable={enable}",
+                str(path),
+            ],
+            reporter=TextReporter(output),
+            exit=False,
+        )
+        return output.getvalue()
 
+    return _run
 
-def test_plugin_loads():
+
+def test_plugin_loads(capsys):
     """Test that pylint can load the plugin."""
-    result = subprocess.run(
-        ["pylint", "--load-plugins=pylint_comfyui", "--list-msgs"],
-        capture_output=True,
-        text=True,
-    )
-    assert result.returncode == 0
-    assert "comfyui-use-folder-paths" in result.stdout
+    with pytest.raises(SystemExit) as excinfo:
+        Run(["--load-plugins=pylint_comfyui", "--list-msgs"], exit=False)
 
+    assert excinfo.value.code == 0
+    assert "comfyui-use-folder-paths" in capsys.readouterr().out
 
-def test_bad_node_detection():
+
+def test_bad_node_detection(pylint_runner):
     """Test that plugin detects issues in bad node example."""
     bad_code = """
 import os
@@ -27,29 +55,16 @@ def process():
     path = os.path.join("output", "result.txt")
 """
 
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-        f.write(bad_code)
-        f.flush()
-
-        result = subprocess.run(
-            [
-                "pylint",
-                "--load-plugins=pylint_comfyui",
-                "--disable=all",
-                "--enable=comfyui-use-folder-paths,comfyui-missing-folder-paths",
-                f.name,
-            ],
-            capture_output=True,
-            text=True,
-        )
-
-        assert "comfyui-use-folder-paths" in result.stdout
-        assert "comfyui-missing-folder-paths" in result.stdout
+    output = pylint_runner(
+        bad_code,
+        "comfyui-use-folder-paths,comfyui-missing-folder-paths",
+    )
 
-    Path(f.name).unlink()
+    assert "comfyui-use-folder-paths" in output
+    assert "comfyui-missing-folder-paths" in output
 
 
-def test_good_node_passes():
+def test_good_node_passes(pylint_runner):
     """Test that plugin passes good node example."""
     good_code = """
 import folder_paths
@@ -60,23 +75,129 @@ def process():
     path = os.path.join(models_dir, "result.txt")
 """
 
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-        f.write(good_code)
-        f.flush()
+    output = pylint_runner(
+        good_code,
+        "comfyui-use-folder-paths,comfyui-missing-folder-paths",
+    )
 
-        result = subprocess.run(
-            [
-                "pylint",
-                "--load-plugins=pylint_comfyui",
-                "--disable=all",
-                "--enable=comfyui-use-folder-paths,comfyui-missing-folder-paths",
-                f.name,
-            ],
-            capture_output=True,
-            text=True,
-        )
+    assert "comfyui-use-folder-paths" not in output
+    assert "comfyui-missing-folder-paths" not in output
+
+
+def test_hardcoded_path_detection(pylint_runner):
+    """Test that plugin flags hardcoded paths in string constants."""
+    bad_code = """
+RELATIVE = 'cp "../weights.bin" .'
+COMFY_DIR = 'ls "/data/models/ckpt"'
+NO_SEPARATOR = 'load "models" here'
+URL = "https://example.com/a"
+RAW = b'cp "../weights.bin" .'
+SIZE = 42
+"""
+
+    output = pylint_runner(bad_code, "comfyui-hardcoded-path")
+
+    assert output.count("comfyui-hardcoded-path") == 2
+    assert "../weights.bin" in output
+    assert "/data/models/ckpt" in output
+    assert "load" not in output
+    assert "example.com" not in output
+
+
+def test_security_call_detection(pylint_runner):
+    """Test that plugin flags eval/exec and shell command calls."""
+    bad_code = """
+import os
+import subprocess
+
+def process(code):
+    eval(code)
+    exec(code)
+    subprocess.run(["ls"])
+    os.system("ls")
+    obj.eval()
+"""
+
+    output = pylint_runner(
+        bad_code,
+        "comfyui-no-eval,comfyui-no-exec,comfyui-subprocess-warning",
+    )
+
+    assert output.count("comfyui-no-eval") == 1
+    assert "comfyui-no-exec" in output
+    assert "subprocess.run" in output
+    assert "os.system" in output
+
+
+def test_obfuscation_detection(pylint_runner):
+    """Test that plugin flags obfuscated source code."""
+    bad_code = """
+def process():
+    name = chr(101) + chr(118)
+    return name
+"""
+
+    output = pylint_runner(bad_code, "comfyui-no-obfuscation")
+
+    assert "comfyui-no-obfuscation" in output
+
+
+def test_non_api_import_detection(pylint_runner):
+    """Test that plugin flags imports from internal ComfyUI modules."""
+    bad_code = """
+import comfy.model_management
+from comfy.sd import load_checkpoint
+from comfy_api.latest import io
+import comfy_extras
+"""
+
+    output = pylint_runner(bad_code, "comfyui-non-api-import")
+
+    assert output.count("comfyui-non-api-import") == 2
+    assert "comfy.model_management" in output
+    assert "comfy.sd" in output
+
+
+def test_custom_route_detection(pylint_runner):
+    """Test that plugin flags PromptServer route registration."""
+    bad_code = """
+from server import PromptServer
+import server
+
+@PromptServer.instance.routes.post("/my_route")
+async def handler(request):
+    pass
+
+app = server.PromptServer.instance.app
+routes = other.routes
+dynamic_routes = getattr(PromptServer, "instance").routes
+called_routes = PromptServer.get_instance().routes
+other_routes = get_other().routes
+"""
+
+    output = pylint_runner(bad_code, "comfyui-no-custom-routes")
+
+    assert output.count("comfyui-no-custom-routes") == 4
+    assert "PromptServer.instance.routes" in output
+    assert "server.PromptServer.instance.app" in output
+    assert "getattr(PromptServer, 'instance').routes" in output
+    assert "PromptServer.get_instance().routes" in output
+
+
+def test_manual_device_detection(pylint_runner):
+    """Test that plugin flags manual torch device handling."""
+    bad_code = """
+import torch
+
+def process():
+    if torch.cuda.is_available():
+        device = torch.device("cuda")
+    count = torch.cuda.device_count()
+    tensor = torch.zeros(1)
+"""
 
-        assert "comfyui-use-folder-paths" not in result.stdout
-        assert "comfyui-missing-folder-paths" not in result.stdout
+    output = pylint_runner(bad_code, "comfyui-use-model-management")
 
-    Path(f.name).unlink()
+    assert output.count("comfyui-use-model-management") == 3
+    assert "instead of torch.cuda.is_available" in output
+    assert "instead of torch.device" in output